@@ -1,7 +1,10 @@
 """
 Configuration Module - Model Mappings, Environment Variables, Security Settings
 """
+import functools
 import os
+import sys
+from types import MappingProxyType
 
 from google.genai.types import (
     SafetySetting,
@@ -14,43 +17,47 @@ from google.genai.types import (
 # Model Mapping
 # ============================================================================
 
+def _intern_mapping(mapping: dict) -> dict:
+    """Intern mapping keys/values once at import; resolved model names are then shared by every request"""
+    return {sys.intern(k): sys.intern(v) for k, v in mapping.items()}
+
+
+# Vendor prefixes accepted in front of model names (e.g. "google/gemini-2.5-pro")
+# Mappings are keyed by the bare name; see resolve_model()
+_VENDOR_PREFIXES = ("google/", "anthropic/")
+
 # Gemini Model Mapping: OpenAI-style name -> Google GenAI model name
-GEMINI_MODEL_MAPPING = {
+GEMINI_MODEL_MAPPING = _intern_mapping({
     # Gemini 3 series
-    "google/gemini-3-pro-preview": "gemini-3-pro-preview",
-    "google/gemini-3-flash-preview": "gemini-3-flash-preview",
-    "google/gemini-3.1-pro-preview": "gemini-3.1-pro-preview",
-    "google/gemini-3.1-flash-lite-preview": "gemini-3.1-flash-lite-preview",
     "gemini-3-pro-preview": "gemini-3-pro-preview",
     "gemini-3-flash-preview": "gemini-3-flash-preview",
     "gemini-3.1-pro-preview": "gemini-3.1-pro-preview",
-    "google/gemini-3.1-flash-lite-preview": "gemini-3.1-flash-lite-preview",
+    "gemini-3.1-flash-lite-preview": "gemini-3.1-flash-lite-preview",
     
     # Gemini 2.5 series
-    "google/gemini-2.5-pro": "gemini-2.5-pro",
-    "google/gemini-2.5-flash": "gemini-2.5-flash",
-    "google/gemini-2.5-flash-lite": "gemini-2.5-flash-lite",
-    "google/gemini-2.5-flash-lite-preview-09-2025": "gemini-2.5-flash-lite-preview-09-2025",
     "gemini-2.5-pro": "gemini-2.5-pro",
     "gemini-2.5-flash": "gemini-2.5-flash",
     "gemini-2.5-flash-lite": "gemini-2.5-flash-lite",
     "gemini-2.5-flash-lite-preview-09-2025": "gemini-2.5-flash-lite-preview-09-2025",
-}
+})
 
 # Claude Model Mapping: OpenAI-style name -> Vertex AI Model ID
-CLAUDE_MODEL_MAPPING = {
+CLAUDE_MODEL_MAPPING = _intern_mapping({
     # Claude 4.5 series
-    "anthropic/claude-sonnet-4.5": "claude-sonnet-4-5@20250929",
-    "anthropic/claude-opus-4.5": "claude-opus-4-5@20251101",
     "claude-sonnet-4.5": "claude-sonnet-4-5@20250929",
     "claude-opus-4.5": "claude-opus-4-5@20251101",
     # Claude Haiku series
-    "anthropic/claude-haiku-4.5": "claude-haiku-4-5@20251001",
     "claude-haiku-4.5": "claude-haiku-4-5@20251001",
-}
+})
 
-# Merge all model mappings
-ALL_MODEL_MAPPING = {**GEMINI_MODEL_MAPPING, **CLAUDE_MODEL_MAPPING}
+# Merge all model mappings (read-only view, built once at import)
+ALL_MODEL_MAPPING = MappingProxyType({**GEMINI_MODEL_MAPPING, **CLAUDE_MODEL_MAPPING})
+
+# Precomputed lookup sets and prefixes for model routing
+_CLAUDE_KEYS = frozenset(CLAUDE_MODEL_MAPPING)
+_GEMINI_KEYS = frozenset(GEMINI_MODEL_MAPPING)
+_CLAUDE_PREFIXES = ("anthropic/", "claude")
+_GEMINI_PREFIXES = ("google/", "gemini")
 
 
 # ============================================================================
@@ -74,23 +81,41 @@ CLAUDE_LOCATION = os.environ.get("CLAUDE_LOCATION", "global")
 # ============================================================================
 
 # Gemini Safety Settings - All set to OFF
-SAFETY_SETTINGS = [
+# Built once at import and shared by every request; tuple so it cannot be mutated
+SAFETY_SETTINGS = (
     SafetySetting(category=HarmCategory.HARM_CATEGORY_HARASSMENT, threshold=HarmBlockThreshold.OFF),
     SafetySetting(category=HarmCategory.HARM_CATEGORY_HATE_SPEECH, threshold=HarmBlockThreshold.OFF),
     SafetySetting(category=HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT, threshold=HarmBlockThreshold.OFF),
     SafetySetting(category=HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT, threshold=HarmBlockThreshold.OFF),
-]
+)
 
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+def _canon(model_name: str) -> str:
+    """Strip the vendor prefix ("google/", "anthropic/") from a model name"""
+    return model_name.split("/", 1)[1] if model_name.startswith(_VENDOR_PREFIXES) else model_name
+
+
+@functools.lru_cache(maxsize=64)
+def resolve_model(model_name: str) -> str:
+    """
+    Resolve a client model name to the upstream model ID, falling back to the bare name
+    
+    Clients use a handful of distinct model strings, so resolutions are memoized;
+    the cache is bounded since the name comes straight from the request.
+    """
+    name = _canon(model_name)
+    return ALL_MODEL_MAPPING.get(name, name)
+
+
 def is_claude_model(model_name: str) -> bool:
     """Check if it is a Claude model"""
-    return model_name in CLAUDE_MODEL_MAPPING or model_name.startswith(("anthropic/", "claude"))
+    return model_name in _CLAUDE_KEYS or model_name.startswith(_CLAUDE_PREFIXES)
 
 
 def is_gemini_model(model_name: str) -> bool:
     """Check if it is a Gemini model"""
-    return model_name in GEMINI_MODEL_MAPPING or model_name.startswith(("google/", "gemini"))
+    return model_name in _GEMINI_KEYS or model_name.startswith(_GEMINI_PREFIXES)
@@ -3,17 +3,120 @@ Message Format Conversion - OpenAI Format <-> Gemini/Claude Format
 """
 import base64
 import json
+from itertools import groupby
+from operator import attrgetter
 from typing import List, Optional
 
-from google.genai.types import Content, Part
+import orjson
+from google.genai.types import Content, Part, FunctionCall as GeminiFunctionCall
 
 from models import ChatMessage
 
 
+# ============================================================================
+# Shared Helpers
+# ============================================================================
+
+def json_dumps(obj) -> str:
+    """
+    Serialize to a JSON string with orjson
+    
+    orjson rejects integers beyond 64 bits (TypeError), which the stdlib json
+    module accepts, so those payloads fall back to json.
+    """
+    try:
+        return orjson.dumps(obj).decode()
+    except TypeError:
+        return json.dumps(obj)
+
+
+def json_loads(data: str):
+    """
+    Parse client-supplied JSON (tool call arguments, tool results) with stdlib json
+    
+    orjson would reject NaN / Infinity and turn integers beyond 64 bits into floats
+    without raising, so these payloads keep the stdlib parser for exact results.
+    """
+    return json.loads(data)
+
+
+def _parse_data_url(image_url: str) -> tuple[str, str]:
+    """Split a data URL ("data:image/png;base64,xxx") into (mime_type, data)"""
+    meta, _, data = image_url.partition(",")
+    # Skip the "data:" prefix; the mime type ends at the first ";" (if any)
+    return meta[5:].partition(";")[0], data
+
+
+def _image_url(item: dict) -> str:
+    """Extract the URL from an "image_url" content item"""
+    image = item.get("image_url")
+    return image.get("url", "") if image else ""
+
+
 # ============================================================================
 # Gemini Message Conversion
 # ============================================================================
 
+def _genai_parts_from_str(content: str) -> List[Part]:
+    """Text content -> single text Part"""
+    return [Part.from_text(text=content)]
+
+
+# Content item types that map to a Gemini Part; others are skipped
+_GENAI_ITEM_TYPES = frozenset(("text", "image_url"))
+
+
+def _genai_part_from_item(item: dict) -> Part:
+    """Single "text" / "image_url" content item -> Part"""
+    if item["type"] == "text":
+        return Part.from_text(text=item.get("text", ""))
+    
+    image_url = _image_url(item)
+    if image_url.startswith("data:"):
+        mime_type, data = _parse_data_url(image_url)
+        return Part.from_bytes(data=base64.b64decode(data), mime_type=mime_type)
+    return Part.from_uri(file_uri=image_url, mime_type="image/jpeg")
+
+
+def _genai_parts_from_list(content: List[dict]) -> List[Part]:
+    """Multi-modal content list -> text/image Parts"""
+    return [_genai_part_from_item(item) for item in content if item.get("type") in _GENAI_ITEM_TYPES]
+
+
+def _genai_parts_from_other(content) -> List[Part]:
+    """Empty or unexpected content -> text Part of its string form"""
+    return [Part.from_text(text=str(content) if content else "")]
+
+
+# Content converters dispatched on type(content)
+_GENAI_CONTENT_HANDLERS = {
+    str: _genai_parts_from_str,
+    list: _genai_parts_from_list,
+}
+
+
+def _genai_function_response(tool_msg: ChatMessage) -> Part:
+    """Tool result message -> function_response Part"""
+    tool_call_id = tool_msg.tool_call_id or "unknown"
+    tool_content = tool_msg.content
+    
+    # Already structured content needs no parsing; attempt to parse JSON strings
+    if isinstance(tool_content, (dict, list)):
+        result_data = tool_content
+    elif isinstance(tool_content, str):
+        try:
+            result_data = json_loads(tool_content)
+        except ValueError:
+            result_data = {"result": tool_content}
+    else:
+        result_data = {"result": tool_content}
+    
+    return Part.from_function_response(
+        name=tool_msg.name or tool_call_id,
+        response=result_data
+    )
+
+
 def convert_messages_to_genai(messages: List[ChatMessage]) -> tuple[Optional[str], List[Content]]:
     """
     Convert OpenAI format messages to Google GenAI format
@@ -24,110 +127,66 @@ def convert_messages_to_genai(messages: List[ChatMessage]) -> tuple[Optional[str
     system_instruction = None
     contents = []
     
-    # Preprocessing: Collect consecutive tool message indices
-    i = 0
-    while i < len(messages):
-        msg = messages[i]
-        role = msg.role
-        content = msg.content
-        
-        # System message
-        if role == "system":
-            if isinstance(content, str):
-                system_instruction = content
-            i += 1
-            continue
-        
-        # Tool result messages - need to merge consecutive tool messages
+    # Walk runs of consecutive messages sharing the same role
+    for role, group in groupby(messages, key=attrgetter("role")):
+        # Tool result messages - merge consecutive tool messages into the same Content
         if role == "tool":
-            # Collect all consecutive tool messages
-            tool_parts = []
-            while i < len(messages) and messages[i].role == "tool":
-                tool_msg = messages[i]
-                tool_call_id = tool_msg.tool_call_id or "unknown"
-                tool_content = tool_msg.content
-                
-                # Attempt to parse JSON
-                try:
-                    result_data = json.loads(tool_content) if isinstance(tool_content, str) else tool_content
-                except (json.JSONDecodeError, TypeError):
-                    result_data = {"result": tool_content}
-                
-                tool_parts.append(Part.from_function_response(
-                    name=tool_msg.name or tool_call_id,
-                    response=result_data
-                ))
-                i += 1
-            
-            # Put all tool responses in the same Content
-            if tool_parts:
-                contents.append(Content(role="user", parts=tool_parts))
+            contents.append(Content(role="user", parts=[_genai_function_response(tool_msg) for tool_msg in group]))
             continue
         
-        # Assistant with tool_calls
-        if role == "assistant" and msg.tool_calls:
-            parts = []
+        for msg in group:
+            content = msg.content
             
-            # Add text content first (if any)
-            if content:
+            # System message
+            if role == "system":
                 if isinstance(content, str):
-                    parts.append(Part.from_text(text=content))
+                    system_instruction = content
+                continue
             
-            # Add function calls
-            for tool_call in msg.tool_calls:
-                try:
-                    args = json.loads(tool_call.function.arguments) if tool_call.function.arguments else {}
-                except (json.JSONDecodeError, TypeError):
-                    args = {}
-
-                # Use thought_signature from client if provided
-                ts = tool_call.thought_signature or msg.thought_signature
-                if ts:
-                    from google.genai.types import FunctionCall as GeminiFunctionCall
-                    ts_bytes = base64.b64decode(ts) if isinstance(ts, str) else ts
-                    fc_part = Part(
-                        function_call=GeminiFunctionCall(
+            # Assistant with tool_calls
+            if role == "assistant" and msg.tool_calls:
+                parts = []
+                
+                # Add text content first (if any)
+                if content:
+                    if isinstance(content, str):
+                        parts.append(Part.from_text(text=content))
+                
+                # Add function calls
+                for tool_call in msg.tool_calls:
+                    try:
+                        args = json_loads(tool_call.function.arguments) if tool_call.function.arguments else {}
+                    except (ValueError, TypeError):
+                        args = {}
+                    
+                    # Use thought_signature from client if provided
+                    ts = tool_call.thought_signature or msg.thought_signature
+                    if ts:
+                        ts_bytes = base64.b64decode(ts) if isinstance(ts, str) else ts
+                        fc_part = Part(
+                            function_call=GeminiFunctionCall(
+                                name=tool_call.function.name,
+                                args=args
+                            ),
+                            thought_signature=ts_bytes
+                        )
+                        parts.append(fc_part)
+                    else:
+                        parts.append(Part.from_function_call(
                             name=tool_call.function.name,
                             args=args
-                        ),
-                        thought_signature=ts_bytes
-                    )
-                    parts.append(fc_part)
-                else:
-                    parts.append(Part.from_function_call(
-                        name=tool_call.function.name,
-                        args=args
-                    ))
+                        ))
+                
+                contents.append(Content(role="model", parts=parts))
+                continue
             
-            contents.append(Content(role="model", parts=parts))
-            i += 1
-            continue
-        
-        # Regular user/assistant messages
-        genai_role = "user" if role == "user" else "model"
-        
-        if isinstance(content, str):
-            parts = [Part.from_text(text=content)]
-        elif isinstance(content, list):
-            parts = []
-            for item in content:
-                if item.get("type") == "text":
-                    parts.append(Part.from_text(text=item.get("text", "")))
-                elif item.get("type") == "image_url":
-                    image_url = item.get("image_url", {}).get("url", "")
-                    if image_url.startswith("data:"):
-                        header, data = image_url.split(",", 1)
-                        mime_type = header.split(";")[0].split(":")[1]
-                        parts.append(Part.from_bytes(data=base64.b64decode(data), mime_type=mime_type))
-                    else:
-                        parts.append(Part.from_uri(file_uri=image_url, mime_type="image/jpeg"))
-        else:
-            parts = [Part.from_text(text=str(content) if content else "")]
-        
-        if parts:
-            contents.append(Content(role=genai_role, parts=parts))
-        
-        i += 1
+            # Regular user/assistant messages
+            genai_role = "user" if role == "user" else "model"
+            
+            parts = _GENAI_CONTENT_HANDLERS.get(type(content), _genai_parts_from_other)(content)
+            
+            if parts:
+                contents.append(Content(role=genai_role, parts=parts))
     
     return system_instruction, contents
 
@@ -136,6 +195,99 @@ def convert_messages_to_genai(messages: List[ChatMessage]) -> tuple[Optional[str
 # Claude Message Conversion
 # ============================================================================
 
+def _claude_content_from_str(content: str) -> str:
+    """Text content is passed through as-is"""
+    return content
+
+
+def _claude_content_from_list(content: List[dict]) -> List[dict]:
+    """Multi-modal content list -> Claude text/image blocks"""
+    claude_content = []
+    for item in content:
+        if item.get("type") == "text":
+            claude_content.append({"type": "text", "text": item.get("text", "")})
+        elif item.get("type") == "image_url":
+            image_url = _image_url(item)
+            if image_url.startswith("data:"):
+                # Base64 image
+                mime_type, data = _parse_data_url(image_url)
+                claude_content.append({
+                    "type": "image",
+                    "source": {
+                        "type": "base64",
+                        "media_type": mime_type,
+                        "data": data,
+                    }
+                })
+            else:
+                # URL image
+                claude_content.append({
+                    "type": "image",
+                    "source": {
+                        "type": "url",
+                        "url": image_url,
+                    }
+                })
+    return claude_content
+
+
+def _claude_content_from_other(content) -> str:
+    """Empty or unexpected content -> its string form"""
+    return str(content) if content else ""
+
+
+# Content converters dispatched on type(content)
+_CLAUDE_CONTENT_HANDLERS = {
+    str: _claude_content_from_str,
+    list: _claude_content_from_list,
+}
+
+
+def _convert_claude_message(msg: ChatMessage) -> dict:
+    """Convert a single non-system OpenAI message to a Claude message"""
+    role = msg.role
+    content = msg.content
+    
+    # Tool result message
+    if role == "tool":
+        # Claude uses tool_result type
+        return {
+            "role": "user",
+            "content": [{
+                "type": "tool_result",
+                "tool_use_id": msg.tool_call_id,
+                "content": content if isinstance(content, str) else json_dumps(content)
+            }]
+        }
+    
+    # Assistant with tool_calls
+    if role == "assistant" and msg.tool_calls:
+        claude_content = []
+        # Add text content first (if any)
+        if content:
+            if isinstance(content, str):
+                claude_content.append({"type": "text", "text": content})
+        # Add tool_use blocks
+        for tool_call in msg.tool_calls:
+            try:
+                input_data = json_loads(tool_call.function.arguments)
+            except (ValueError, TypeError):
+                input_data = {}
+            claude_content.append({
+                "type": "tool_use",
+                "id": tool_call.id,
+                "name": tool_call.function.name,
+                "input": input_data
+            })
+        return {"role": "assistant", "content": claude_content}
+    
+    # Regular message processing
+    # Claude only supports user and assistant roles
+    claude_role = "user" if role == "user" else "assistant"
+    claude_content = _CLAUDE_CONTENT_HANDLERS.get(type(content), _claude_content_from_other)(content)
+    return {"role": claude_role, "content": claude_content}
+
+
 def convert_messages_to_claude(messages: List[ChatMessage]) -> tuple[Optional[str], List[dict]]:
     """
     Convert OpenAI format messages to Claude format
@@ -143,89 +295,17 @@ def convert_messages_to_claude(messages: List[ChatMessage]) -> tuple[Optional[st
     """
     system_prompt = None
     claude_messages = []
+    # Bind hot callables locally for the per-message loop
+    append = claude_messages.append
+    convert = _convert_claude_message
     
     for msg in messages:
-        role = msg.role
-        content = msg.content
-        
         # System message
-        if role == "system":
-            if isinstance(content, str):
-                system_prompt = content
+        if msg.role == "system":
+            if isinstance(msg.content, str):
+                system_prompt = msg.content
             continue
         
-        # Tool result message
-        if role == "tool":
-            # Claude uses tool_result type
-            claude_messages.append({
-                "role": "user",
-                "content": [{
-                    "type": "tool_result",
-                    "tool_use_id": msg.tool_call_id,
-                    "content": content if isinstance(content, str) else json.dumps(content)
-                }]
-            })
-            continue
-        
-        # Claude only supports user and assistant roles
-        claude_role = "user" if role == "user" else "assistant"
-        
-        # Assistant with tool_calls
-        if role == "assistant" and msg.tool_calls:
-            claude_content = []
-            # Add text content first (if any)
-            if content:
-                if isinstance(content, str):
-                    claude_content.append({"type": "text", "text": content})
-            # Add tool_use blocks
-            for tool_call in msg.tool_calls:
-                try:
-                    input_data = json.loads(tool_call.function.arguments)
-                except (json.JSONDecodeError, TypeError):
-                    input_data = {}
-                claude_content.append({
-                    "type": "tool_use",
-                    "id": tool_call.id,
-                    "name": tool_call.function.name,
-                    "input": input_data
-                })
-            claude_messages.append({"role": "assistant", "content": claude_content})
-            continue
-        
-        # Regular message processing
-        if isinstance(content, str):
-            claude_messages.append({"role": claude_role, "content": content})
-        elif isinstance(content, list):
-            # Handle multi-modal content
-            claude_content = []
-            for item in content:
-                if item.get("type") == "text":
-                    claude_content.append({"type": "text", "text": item.get("text", "")})
-                elif item.get("type") == "image_url":
-                    image_url = item.get("image_url", {}).get("url", "")
-                    if image_url.startswith("data:"):
-                        # Base64 image
-                        header, data = image_url.split(",", 1)
-                        mime_type = header.split(";")[0].split(":")[1]
-                        claude_content.append({
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": mime_type,
-                                "data": data,
-                            }
-                        })
-                    else:
-                        # URL image
-                        claude_content.append({
-                            "type": "image",
-                            "source": {
-                                "type": "url",
-                                "url": image_url,
-                            }
-                        })
-            claude_messages.append({"role": claude_role, "content": claude_content})
-        else:
-            claude_messages.append({"role": claude_role, "content": str(content) if content else ""})
+        append(convert(msg))
     
     return system_prompt, claude_messages
@@ -1,12 +1,14 @@
 """
 Tool Format Conversion - OpenAI Format <-> Gemini/Claude Format
 """
+import functools
 import json
-import uuid
+import secrets
 from typing import List, Optional
 
 from google.genai import types
 
+from converters.messages import json_dumps
 from models import Tool, ToolCall, FunctionCall
 
 
@@ -14,6 +16,26 @@ from models import Tool, ToolCall, FunctionCall
 # OpenAI -> Gemini Tool Conversion
 # ============================================================================
 
+def _tools_key(tools: List[Tool]) -> tuple:
+    """
+    Build a hashable fingerprint of a tools list, used as the conversion cache key
+    
+    Clients usually resend the same tool catalog on every turn, so converted
+    tools are cached per unique (name, description, parameters) set. The cached
+    builders parse the schema back with stdlib json: they only run on a cache
+    miss, and json keeps integers beyond 64 bits exact.
+    """
+    return tuple(
+        (
+            tool.function.name,
+            tool.function.description,
+            json_dumps(tool.function.parameters) if tool.function.parameters else None,
+        )
+        for tool in tools
+        if tool.type == "function"
+    )
+
+
 def convert_tools_to_gemini(tools: List[Tool]) -> types.Tool:
     """
     Convert OpenAI format tools to Gemini format
@@ -28,52 +50,53 @@ def convert_tools_to_gemini(tools: List[Tool]) -> types.Tool:
     to pass the original JSON Schema, instead of passing dict directly. 
     Passing dict directly will lead to validation by the SDK's Pydantic model 
     according to Schema type, resulting in "Extra inputs are not permitted" error.
+    
+    Note: The returned types.Tool is cached and shared between requests; do not mutate it.
     """
+    return _convert_tools_to_gemini_cached(_tools_key(tools))
+
+
+@functools.lru_cache(maxsize=128)
+def _convert_tools_to_gemini_cached(tools_key: tuple) -> types.Tool:
+    """Build Gemini tool declarations from a _tools_key() fingerprint"""
     function_declarations = []
     
-    for tool in tools:
-        if tool.type != "function":
-            continue
-        
-        func = tool.function
+    for name, description, parameters_json in tools_key:
+        decl_kwargs = {"name": name}
         
-        decl_kwargs = {"name": func.name}
+        if description:
+            decl_kwargs["description"] = description
         
-        if func.description:
-            decl_kwargs["description"] = func.description
-        
-        if func.parameters:
+        if parameters_json:
             # Use parameters_json_schema to pass original JSON Schema
             # This ensures SDK correctly handles oneOf, anyOf and other JSON Schema features
-            decl_kwargs["parameters_json_schema"] = func.parameters
+            decl_kwargs["parameters_json_schema"] = json.loads(parameters_json)
         
         function_declarations.append(types.FunctionDeclaration(**decl_kwargs))
     
     return types.Tool(function_declarations=function_declarations)
 
 
+# Prebuilt tool_config for the string forms of tool_choice
+_GEMINI_TOOL_CHOICE_STATIC = {
+    "none": types.ToolConfig(function_calling_config=types.FunctionCallingConfig(mode="NONE")),
+    "auto": types.ToolConfig(function_calling_config=types.FunctionCallingConfig(mode="AUTO")),
+    "required": types.ToolConfig(function_calling_config=types.FunctionCallingConfig(mode="ANY")),
+}
+
+
 def convert_tool_choice_to_gemini(tool_choice: Optional[str | dict]) -> Optional[types.ToolConfig]:
     """Convert OpenAI's tool_choice to Gemini's tool_config"""
     if tool_choice is None:
         return None
     
     if isinstance(tool_choice, str):
-        if tool_choice == "none":
-            return types.ToolConfig(
-                function_calling_config=types.FunctionCallingConfig(mode="NONE")
-            )
-        elif tool_choice == "auto":
-            return types.ToolConfig(
-                function_calling_config=types.FunctionCallingConfig(mode="AUTO")
-            )
-        elif tool_choice == "required":
-            return types.ToolConfig(
-                function_calling_config=types.FunctionCallingConfig(mode="ANY")
-            )
+        return _GEMINI_TOOL_CHOICE_STATIC.get(tool_choice)
     elif isinstance(tool_choice, dict):
         # {"type": "function", "function": {"name": "xxx"}}
         if tool_choice.get("type") == "function":
-            func_name = tool_choice.get("function", {}).get("name")
+            function = tool_choice.get("function")
+            func_name = function.get("name") if function else None
             if func_name:
                 return types.ToolConfig(
                     function_calling_config=types.FunctionCallingConfig(
@@ -98,23 +121,27 @@ def convert_tools_to_claude(tools: List[Tool]) -> List[dict]:
     
     Claude format:
     {"name": "xxx", "description": "xxx", "input_schema": {...}}
+    
+    Note: The returned list is cached and shared between requests; do not mutate it.
     """
+    return _convert_tools_to_claude_cached(_tools_key(tools))
+
+
+@functools.lru_cache(maxsize=128)
+def _convert_tools_to_claude_cached(tools_key: tuple) -> List[dict]:
+    """Build Claude tool definitions from a _tools_key() fingerprint"""
     claude_tools = []
     
-    for tool in tools:
-        if tool.type != "function":
-            continue
-        
-        func = tool.function
+    for name, description, parameters_json in tools_key:
         claude_tool = {
-            "name": func.name,
+            "name": name,
         }
         
-        if func.description:
-            claude_tool["description"] = func.description
+        if description:
+            claude_tool["description"] = description
         
-        if func.parameters:
-            claude_tool["input_schema"] = func.parameters
+        if parameters_json:
+            claude_tool["input_schema"] = json.loads(parameters_json)
         else:
             # Claude needs at least an empty input_schema
             claude_tool["input_schema"] = {"type": "object", "properties": {}}
@@ -124,23 +151,26 @@ def convert_tools_to_claude(tools: List[Tool]) -> List[dict]:
     return claude_tools
 
 
+# Claude tool_choice for the string forms of tool_choice
+# Claude does not have a direct "none", achieved by not passing tools
+_CLAUDE_TOOL_CHOICE_STATIC = {
+    "auto": {"type": "auto"},
+    "required": {"type": "any"},
+}
+
+
 def convert_tool_choice_to_claude(tool_choice: Optional[str | dict]) -> Optional[dict]:
     """Convert OpenAI's tool_choice to Claude's tool_choice"""
     if tool_choice is None:
         return None
     
     if isinstance(tool_choice, str):
-        if tool_choice == "none":
-            # Claude does not have a direct "none", achieved by not passing tools
-            return None
-        elif tool_choice == "auto":
-            return {"type": "auto"}
-        elif tool_choice == "required":
-            return {"type": "any"}
+        return _CLAUDE_TOOL_CHOICE_STATIC.get(tool_choice)
     elif isinstance(tool_choice, dict):
         # {"type": "function", "function": {"name": "xxx"}}
         if tool_choice.get("type") == "function":
-            func_name = tool_choice.get("function", {}).get("name")
+            function = tool_choice.get("function")
+            func_name = function.get("name") if function else None
             if func_name:
                 return {"type": "tool", "name": func_name}
     
@@ -160,12 +190,13 @@ def convert_gemini_function_call(function_call, thought_signature: str = None) -
     
     Note: Gemini 3.0+ requires thought_signature for multi-turn tool calling
     """
-    return ToolCall(
-        id=f"call_{uuid.uuid4().hex[:24]}",
+    # Fields come from an already-validated SDK response; skip pydantic validation
+    return ToolCall.model_construct(
+        id=f"call_{secrets.token_hex(12)}",
         type="function",
-        function=FunctionCall(
+        function=FunctionCall.model_construct(
             name=function_call.name,
-            arguments=json.dumps(function_call.args) if function_call.args else "{}"
+            arguments=json_dumps(function_call.args) if function_call.args else "{}"
         ),
         thought_signature=thought_signature
     )
@@ -178,21 +209,16 @@ def convert_claude_tool_use(tool_use_block) -> ToolCall:
     Claude tool_use: id, name, input (dict)
     OpenAI tool_call: id, type, function: {name, arguments (JSON string)}
     """
-    # tool_use_block can be a dict or an object
-    if isinstance(tool_use_block, dict):
-        tool_id = tool_use_block.get("id", f"call_{uuid.uuid4().hex[:24]}")
-        name = tool_use_block.get("name", "")
-        input_data = tool_use_block.get("input", {})
-    else:
-        tool_id = getattr(tool_use_block, "id", f"call_{uuid.uuid4().hex[:24]}")
-        name = getattr(tool_use_block, "name", "")
-        input_data = getattr(tool_use_block, "input", {})
-    
-    return ToolCall(
-        id=tool_id,
+    # tool_use_block can be a dict or an object; normalize to its field dict once
+    fields = tool_use_block if isinstance(tool_use_block, dict) else vars(tool_use_block)
+    input_data = fields.get("input")
+    
+    # Fields come from an already-validated SDK response; skip pydantic validation
+    return ToolCall.model_construct(
+        id=fields.get("id") or f"call_{secrets.token_hex(12)}",
         type="function",
-        function=FunctionCall(
-            name=name,
-            arguments=json.dumps(input_data) if input_data else "{}"
+        function=FunctionCall.model_construct(
+            name=fields.get("name", ""),
+            arguments=json_dumps(input_data) if input_data else "{}"
         )
     )
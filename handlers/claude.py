@@ -1,15 +1,14 @@
 """
 Claude Request Handler Module
 """
-import json
-import time
-import traceback
-import uuid
+import logging
 from typing import AsyncGenerator
 
-from anthropic import AnthropicVertex
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from anthropic import AsyncAnthropicVertex
 
-from config import CLAUDE_MODEL_MAPPING
+from config import resolve_model
 from models import ChatCompletionRequest, ToolCall
 from converters.messages import convert_messages_to_claude
 from converters.tools import (
@@ -17,13 +16,27 @@ from converters.tools import (
     convert_tool_choice_to_claude,
     convert_claude_tool_use,
 )
+from handlers.common import (
+    DONE_FRAME,
+    OrjsonResponse,
+    TextCoalescer,
+    chunk_prefix,
+    completion_meta,
+    delta_frame,
+    error_frame,
+    finish_frame,
+    tool_arguments_frame,
+    with_flush_deadline,
+)
+
 
+logger = logging.getLogger(__name__)
 
 # Claude client - Set by main.py
-claude_client: AnthropicVertex = None
+claude_client: AsyncAnthropicVertex = None
 
 
-def set_claude_client(client: AnthropicVertex):
+def set_claude_client(client: AsyncAnthropicVertex):
     """Set Claude client"""
     global claude_client
     claude_client = client
@@ -31,10 +44,7 @@ def set_claude_client(client: AnthropicVertex):
 
 async def handle_claude_request(request: ChatCompletionRequest, model_name: str):
     """Handle Claude request"""
-    from fastapi import HTTPException
-    from fastapi.responses import StreamingResponse
-    
-    claude_model = CLAUDE_MODEL_MAPPING.get(model_name, model_name)
+    claude_model = resolve_model(model_name)
     
     system_prompt, messages = convert_messages_to_claude(request.messages)
     
@@ -52,7 +62,7 @@ async def handle_claude_request(request: ChatCompletionRequest, model_name: str)
     if request.top_p is not None:
         kwargs["top_p"] = request.top_p
     if request.stop:
-        kwargs["stop_sequences"] = request.stop if isinstance(request.stop, list) else [request.stop]
+        kwargs["stop_sequences"] = request.stop
     
     # Handle tool calling
     if request.tools:
@@ -96,151 +106,157 @@ async def handle_claude_request(request: ChatCompletionRequest, model_name: str)
                 }
             )
         else:
-            response = claude_client.messages.create(**kwargs)
-            return create_claude_response(response, model_name)
+            response = await claude_client.messages.create(**kwargs)
+            # Serialize directly with orjson, bypassing FastAPI's jsonable_encoder
+            return OrjsonResponse(create_claude_response(response, model_name))
             
     except Exception as e:
-        print(f"Claude error: {e}")
-        traceback.print_exc()
+        logger.exception("Claude request failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def stream_claude_response(kwargs: dict, model_name: str) -> AsyncGenerator[str, None]:
+def _on_content_block_start(event, state: dict):
+    """content_block_start - open a tool call if the block is tool_use"""
+    block = getattr(event, 'content_block', None)
+    if getattr(block, 'type', None) != 'tool_use':
+        return None
+    state["current_tool_call"] = {"id": block.id, "name": block.name}
+    # Send tool calling start
+    return delta_frame(state["prefix"], {
+        "tool_calls": [{
+            "index": state["tool_call_index"],
+            "id": block.id,
+            "type": "function",
+            "function": {
+                "name": block.name,
+                "arguments": ""
+            }
+        }]
+    })
+
+
+def _on_content_block_delta(event, state: dict):
+    """content_block_delta - forward text or tool input increments"""
+    delta = getattr(event, 'delta', None)
+    delta_type = getattr(delta, 'type', None)
+    if delta_type == 'text_delta':
+        # Text increment (buffered, see TextCoalescer)
+        return state["text"].add(delta.text)
+    if delta_type == 'input_json_delta' and state["current_tool_call"]:
+        # Tool input increment
+        return tool_arguments_frame(state["prefix"], state["tool_call_index"], delta.partial_json)
+    return None
+
+
+def _on_content_block_stop(event, state: dict):
+    """content_block_stop - close the current tool call, or flush a finished text block"""
+    if state["current_tool_call"]:
+        state["current_tool_call"] = None
+        state["tool_call_index"] += 1
+        return None
+    return state["text"].flush()
+
+
+# Stream event type -> handler(event, state) returning an SSE frame or None
+_CLAUDE_EVENT_HANDLERS = {
+    'content_block_start': _on_content_block_start,
+    'content_block_delta': _on_content_block_delta,
+    'content_block_stop': _on_content_block_stop,
+}
+
+
+async def stream_claude_response(kwargs: dict, model_name: str) -> AsyncGenerator[bytes, None]:
     """Generate Claude streaming response - Supports tool calling"""
-    request_id = f"chatcmpl-{uuid.uuid4().hex[:29]}"
-    created = int(time.time())
+    request_id, created = completion_meta()
+    # Chunk envelope (id/object/created/model) serialized once per stream
+    prefix = chunk_prefix(request_id, created, model_name)
+    state = {
+        "prefix": prefix,
+        "text": TextCoalescer(prefix),
+        "current_tool_call": None,
+        "tool_call_index": 0,
+    }
     
     try:
-        accumulated_tool_calls = []
-        current_tool_call = None
-        tool_call_index = 0
-        
-        with claude_client.messages.stream(**kwargs) as stream:
-            for event in stream:
-                # Handle different types of events
-                if hasattr(event, 'type'):
-                    if event.type == 'content_block_start':
-                        # Check if it is a tool_use block
-                        if hasattr(event, 'content_block') and hasattr(event.content_block, 'type'):
-                            if event.content_block.type == 'tool_use':
-                                current_tool_call = {
-                                    "id": event.content_block.id,
-                                    "name": event.content_block.name,
-                                    "input": ""
-                                }
-                                # Send tool calling start
-                                delta = {
-                                    "id": request_id,
-                                    "object": "chat.completion.chunk",
-                                    "created": created,
-                                    "model": model_name,
-                                    "choices": [{
-                                        "index": 0,
-                                        "delta": {
-                                            "tool_calls": [{
-                                                "index": tool_call_index,
-                                                "id": current_tool_call["id"],
-                                                "type": "function",
-                                                "function": {
-                                                    "name": current_tool_call["name"],
-                                                    "arguments": ""
-                                                }
-                                            }]
-                                        },
-                                        "finish_reason": None,
-                                    }]
-                                }
-                                yield f"data: {json.dumps(delta)}\n\n"
-                    
-                    elif event.type == 'content_block_delta':
-                        if hasattr(event, 'delta'):
-                            if hasattr(event.delta, 'type'):
-                                if event.delta.type == 'input_json_delta':
-                                    # Tool input increment
-                                    if current_tool_call:
-                                        partial_json = event.delta.partial_json
-                                        delta = {
-                                            "id": request_id,
-                                            "object": "chat.completion.chunk",
-                                            "created": created,
-                                            "model": model_name,
-                                            "choices": [{
-                                                "index": 0,
-                                                "delta": {
-                                                    "tool_calls": [{
-                                                        "index": tool_call_index,
-                                                        "function": {
-                                                            "arguments": partial_json
-                                                        }
-                                                    }]
-                                                },
-                                                "finish_reason": None,
-                                            }]
-                                        }
-                                        yield f"data: {json.dumps(delta)}\n\n"
-                                elif event.delta.type == 'text_delta':
-                                    # Text increment
-                                    delta = {
-                                        "id": request_id,
-                                        "object": "chat.completion.chunk",
-                                        "created": created,
-                                        "model": model_name,
-                                        "choices": [{
-                                            "index": 0,
-                                            "delta": {"content": event.delta.text},
-                                            "finish_reason": None,
-                                        }]
-                                    }
-                                    yield f"data: {json.dumps(delta)}\n\n"
+        async with claude_client.messages.stream(**kwargs) as stream:
+            if "tools" not in kwargs:
+                # Text-only request: no tool_use blocks can arrive, so skip the tool bookkeeping
+                text_buffer = state["text"]
+                async for event in with_flush_deadline(stream, text_buffer):
+                    if type(event) is bytes:
+                        # Buffered text came due while waiting on upstream
+                        yield event
+                        continue
+                    event_type = getattr(event, 'type', None)
+                    if event_type is None:
+                        # Compatible with old text_stream method
+                        text = getattr(event, 'text', None)
+                    elif event_type == 'content_block_delta' and event.delta.type == 'text_delta':
+                        text = event.delta.text
+                    else:
+                        text = None
+                    if text:
+                        frame = text_buffer.add(text)
+                    else:
+                        # Any non-text event (block stop, message_delta, ping, ...) flushes buffered text
+                        frame = text_buffer.flush()
+                    if frame:
+                        yield frame
+            else:
+                async for event in with_flush_deadline(stream, state["text"]):
+                    if type(event) is bytes:
+                        # Buffered text came due while waiting on upstream
+                        yield event
+                        continue
+                    event_type = getattr(event, 'type', None)
+                    if event_type is not None:
+                        handler = _CLAUDE_EVENT_HANDLERS.get(event_type)
+                        if handler:
+                            frame = handler(event, state)
+                            if frame:
+                                yield frame
+                        continue
                     
-                    elif event.type == 'content_block_stop':
-                        if current_tool_call:
-                            accumulated_tool_calls.append(current_tool_call)
-                            current_tool_call = None
-                            tool_call_index += 1
-                
-                # Compatible with old text_stream method
-                elif hasattr(event, 'text'):
-                    delta = {
-                        "id": request_id,
-                        "object": "chat.completion.chunk",
-                        "created": created,
-                        "model": model_name,
-                        "choices": [{
-                            "index": 0,
-                            "delta": {"content": event.text},
-                            "finish_reason": None,
-                        }]
-                    }
-                    yield f"data: {json.dumps(delta)}\n\n"
+                    # Compatible with old text_stream method
+                    text = getattr(event, 'text', None)
+                    if text is not None:
+                        frame = state["text"].add(text)
+                        if frame:
+                            yield frame
+        
+        # Emit any text still buffered
+        frame = state["text"].flush()
+        if frame:
+            yield frame
         
         # Determine finish_reason
-        finish_reason = "tool_calls" if accumulated_tool_calls else "stop"
+        finish_reason = "tool_calls" if state["tool_call_index"] else "stop"
         
-        final_delta = {
-            "id": request_id,
-            "object": "chat.completion.chunk",
-            "created": created,
-            "model": model_name,
-            "choices": [{
-                "index": 0,
-                "delta": {},
-                "finish_reason": finish_reason,
-            }]
-        }
-        yield f"data: {json.dumps(final_delta)}\n\n"
-        yield "data: [DONE]\n\n"
+        yield finish_frame(prefix, finish_reason)
+        yield DONE_FRAME
         
     except Exception as e:
-        error_data = {"error": {"message": str(e), "type": "api_error"}}
-        yield f"data: {json.dumps(error_data)}\n\n"
+        # Text received before the failure still reaches the client
+        frame = state["text"].flush()
+        if frame:
+            yield frame
+        yield error_frame(str(e))
+
+
+# Claude's stop_reason -> OpenAI finish_reason (anything else maps to "stop")
+_CLAUDE_FINISH_REASONS = {
+    "end_turn": "stop",
+    "stop_sequence": "stop",
+    "tool_use": "tool_calls",
+    "max_tokens": "length",
+}
 
 
 def create_claude_response(response, model_name: str) -> dict:
     """Create Claude OpenAI format response - Supports tool calling"""
-    request_id = f"chatcmpl-{uuid.uuid4().hex[:29]}"
+    request_id, created = completion_meta()
     
-    content = ""
+    content_parts = []
     tool_calls = []
 
     # Extract content and tool calls
@@ -248,7 +264,7 @@ def create_claude_response(response, model_name: str) -> dict:
         return {
             "id": request_id,
             "object": "chat.completion",
-            "created": int(time.time()),
+            "created": created,
             "model": model_name,
             "choices": [{
                 "index": 0,
@@ -261,21 +277,25 @@ def create_claude_response(response, model_name: str) -> dict:
     for block in response.content:
         if hasattr(block, 'type'):
             if block.type == 'text':
-                content += block.text
+                content_parts.append(block.text)
             elif block.type == 'tool_use':
                 tool_call = convert_claude_tool_use(block)
-                tool_calls.append(tool_call.model_dump())
+                # Build the dict directly rather than via model_dump()
+                tool_calls.append({
+                    "id": tool_call.id,
+                    "type": "function",
+                    "function": {
+                        "name": tool_call.function.name,
+                        "arguments": tool_call.function.arguments
+                    }
+                })
         elif hasattr(block, 'text'):
-            content += block.text
+            content_parts.append(block.text)
     
     # Determine finish_reason
-    # Claude's stop_reason: "end_turn", "tool_use", "max_tokens", "stop_sequence"
-    if response.stop_reason == "tool_use" or tool_calls:
-        finish_reason = "tool_calls"
-    elif response.stop_reason == "max_tokens":
-        finish_reason = "length"
-    else:
-        finish_reason = "stop"
+    finish_reason = "tool_calls" if tool_calls else _CLAUDE_FINISH_REASONS.get(response.stop_reason, "stop")
+    
+    content = "".join(content_parts)
     
     # Build message
     message = {"role": "assistant"}
@@ -290,7 +310,7 @@ def create_claude_response(response, model_name: str) -> dict:
     return {
         "id": request_id,
         "object": "chat.completion",
-        "created": int(time.time()),
+        "created": created,
         "model": model_name,
         "choices": [{
             "index": 0,
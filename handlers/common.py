@@ -0,0 +1,182 @@
+"""
+Shared Response Helpers - JSON responses and OpenAI chat.completion.chunk SSE framing
+"""
+import asyncio
+import secrets
+import time
+from typing import AsyncIterable, AsyncIterator, Optional
+
+import orjson
+from starlette.responses import Response
+
+
+# ============================================================================
+# Completion Metadata
+# ============================================================================
+
+def completion_meta() -> tuple[str, int]:
+    """Per-request (id, created) pair shared by every chunk / the response body"""
+    # 29 hex chars of randomness; no UUID object needed
+    return f"chatcmpl-{secrets.token_hex(15)[:29]}", int(time.time())
+
+
+# ============================================================================
+# JSON Response
+# ============================================================================
+
+class OrjsonResponse(Response):
+    """
+    JSON response rendered with orjson
+    
+    Returning it from a route skips FastAPI's jsonable_encoder pass. Equivalent to
+    fastapi.responses.ORJSONResponse, which is deprecated in recent FastAPI releases.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+# ============================================================================
+# SSE Chunk Framing
+# ============================================================================
+
+# Every chunk is {"id", "object", "created", "model", "choices": [{"index": 0, "delta", "finish_reason"}]}
+# Only the delta and finish_reason vary within a stream, so the envelope is serialized once per request.
+_DELTA_SUFFIX = b',"finish_reason":null}]}\n\n'
+
+
+def chunk_prefix(request_id: str, created: int, model_name: str) -> bytes:
+    """Build the serialized chunk envelope up to (and including) the "delta" key"""
+    return (
+        b'data: {"id":' + orjson.dumps(request_id)
+        + b',"object":"chat.completion.chunk","created":' + orjson.dumps(created)
+        + b',"model":' + orjson.dumps(model_name)
+        + b',"choices":[{"index":0,"delta":'
+    )
+
+
+def delta_frame(prefix: bytes, delta: dict) -> bytes:
+    """SSE frame carrying a delta (finish_reason null)"""
+    return prefix + orjson.dumps(delta) + _DELTA_SUFFIX
+
+
+def content_frame(prefix: bytes, text: str) -> bytes:
+    """SSE frame carrying a text delta; only the text itself goes through orjson"""
+    return prefix + b'{"content":' + orjson.dumps(text) + b'}' + _DELTA_SUFFIX
+
+
+# Fixed-shape tool call argument increment; only the index and the fragment vary
+_TOOL_ARGUMENTS_DELTA = b'{"tool_calls":[{"index":%d,"function":{"arguments":%b}}]}'
+
+
+def tool_arguments_frame(prefix: bytes, index: int, arguments: str) -> bytes:
+    """SSE frame carrying a fragment of a streamed tool call's arguments"""
+    return prefix + _TOOL_ARGUMENTS_DELTA % (index, orjson.dumps(arguments)) + _DELTA_SUFFIX
+
+
+def finish_frame(prefix: bytes, finish_reason: str) -> bytes:
+    """Final SSE frame with an empty delta and the finish_reason"""
+    return prefix + b'{},"finish_reason":' + orjson.dumps(finish_reason) + b'}]}\n\n'
+
+
+def error_frame(message: str) -> bytes:
+    """SSE frame reporting an upstream error mid-stream"""
+    return b"data: " + orjson.dumps({"error": {"message": message, "type": "api_error"}}) + b"\n\n"
+
+
+# Stream terminator
+DONE_FRAME = b"data: [DONE]\n\n"
+
+
+# ============================================================================
+# Text Delta Coalescing
+# ============================================================================
+
+# Buffered text is flushed once it reaches this many characters or this age (seconds)
+_COALESCE_CHARS = 256
+_COALESCE_SECONDS = 0.02
+
+
+class TextCoalescer:
+    """
+    Buffers consecutive text deltas of one stream and emits them as fewer SSE frames
+    
+    Upstream models emit a delta every few tokens; framing each one separately means
+    one JSON payload and one socket write per delta. The age is measured from the
+    last flush, so the first delta after a pause goes out immediately and only bursts
+    are merged. Streams are read through with_flush_deadline() so buffered text never
+    waits on the next upstream event. Callers must flush() before emitting any
+    non-text frame, before an error frame and at the end of the stream to keep ordering.
+    """
+    __slots__ = ("prefix", "_parts", "_size", "_last_flush")
+
+    def __init__(self, prefix: bytes):
+        self.prefix = prefix
+        self._parts = []
+        self._size = 0
+        self._last_flush = 0.0
+
+    def add(self, text: str) -> Optional[bytes]:
+        """Buffer a text delta; returns a frame when the buffer is due to be flushed"""
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= _COALESCE_CHARS or time.monotonic() - self._last_flush >= _COALESCE_SECONDS:
+            return self.flush()
+        return None
+
+    def due_in(self) -> Optional[float]:
+        """Seconds until buffered text is due to be flushed (None if nothing is buffered)"""
+        if not self._parts:
+            return None
+        return max(0.0, _COALESCE_SECONDS - (time.monotonic() - self._last_flush))
+
+    def flush(self) -> Optional[bytes]:
+        """Emit buffered text as a single content frame (None if nothing is buffered)"""
+        if not self._parts:
+            return None
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        self._last_flush = time.monotonic()
+        return content_frame(self.prefix, text)
+
+
+async def with_flush_deadline(stream: AsyncIterable, text_buffer: TextCoalescer) -> AsyncIterator:
+    """
+    Iterate upstream events, yielding buffered text as a frame (bytes) once it is due
+    
+    While text is buffered, the next event is awaited with a deadline instead of
+    indefinitely; on timeout the text is flushed and the same read keeps going
+    (it is not cancelled). With nothing buffered, events are awaited directly.
+    """
+    iterator = stream.__aiter__()
+    pending = None
+    try:
+        while True:
+            timeout = text_buffer.due_in()
+            if timeout is None and pending is None:
+                try:
+                    event = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+                yield event
+                continue
+            
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            if timeout is not None:
+                done, _ = await asyncio.wait((pending,), timeout=timeout)
+                if not done:
+                    yield text_buffer.flush()
+                    continue
+            
+            read, pending = pending, None
+            try:
+                event = await read
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -2,16 +2,15 @@
 Gemini Request Handler Module
 """
 import base64
-import json
-import time
-import traceback
-import uuid
-from typing import AsyncGenerator, List
+import logging
+from typing import AsyncGenerator, List, Optional
 
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 from google import genai
 from google.genai.types import GenerateContentConfig, Content, ThinkingConfig
 
-from config import GEMINI_MODEL_MAPPING, SAFETY_SETTINGS
+from config import SAFETY_SETTINGS, resolve_model
 from models import ChatCompletionRequest, ToolCall
 from converters.messages import convert_messages_to_genai
 from converters.tools import (
@@ -19,7 +18,20 @@ from converters.tools import (
     convert_tool_choice_to_gemini,
     convert_gemini_function_call,
 )
+from handlers.common import (
+    DONE_FRAME,
+    OrjsonResponse,
+    TextCoalescer,
+    chunk_prefix,
+    completion_meta,
+    delta_frame,
+    error_frame,
+    finish_frame,
+    with_flush_deadline,
+)
+
 
+logger = logging.getLogger(__name__)
 
 # Gemini client - Set by main.py
 gemini_client: genai.Client = None
@@ -33,10 +45,7 @@ def set_gemini_client(client: genai.Client):
 
 async def handle_gemini_request(request: ChatCompletionRequest, model_name: str):
     """Handle Gemini request"""
-    from fastapi import HTTPException
-    from fastapi.responses import StreamingResponse
-
-    genai_model = GEMINI_MODEL_MAPPING.get(model_name, model_name)
+    genai_model = resolve_model(model_name)
 
     system_instruction, contents = convert_messages_to_genai(request.messages)
 
@@ -45,7 +54,7 @@ async def handle_gemini_request(request: ChatCompletionRequest, model_name: str)
         "temperature": request.temperature,
         "top_p": request.top_p,
         "max_output_tokens": request.max_tokens,
-        "stop_sequences": request.stop if isinstance(request.stop, list) else [request.stop] if request.stop else None,
+        "stop_sequences": request.stop,
         "safety_settings": SAFETY_SETTINGS,
         "system_instruction": system_instruction,
     }
@@ -91,31 +100,49 @@ async def handle_gemini_request(request: ChatCompletionRequest, model_name: str)
                 }
             )
         else:
-            response = gemini_client.models.generate_content(
+            response = await gemini_client.aio.models.generate_content(
                 model=genai_model,
                 contents=contents,
                 config=config,
             )
-            return create_gemini_response(response, model_name)
+            # Serialize directly with orjson, bypassing FastAPI's jsonable_encoder
+            return OrjsonResponse(create_gemini_response(response, model_name))
 
     except Exception as e:
-        print(f"Gemini error: {e}")
-        traceback.print_exc()
+        logger.exception("Gemini request failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _encode_thought_signature(ts) -> Optional[str]:
+    """Part.thought_signature (raw bytes) -> base64 string for the client, None if absent"""
+    if not ts:
+        return None
+    if isinstance(ts, bytes):
+        return base64.b64encode(ts).decode('ascii')
+    return str(ts)
+
+
+def _chunk_parts(chunk) -> list:
+    """Parts of the first candidate of a response chunk (empty if there are none)"""
+    candidates = chunk.candidates
+    content = candidates[0].content if candidates else None
+    return (content.parts if content else None) or ()
+
+
 async def stream_gemini_response(
     model: str,
     contents: List[Content],
     config: GenerateContentConfig,
     model_name: str,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Generate Gemini streaming response - Supports tool calling"""
-    request_id = f"chatcmpl-{uuid.uuid4().hex[:29]}"
-    created = int(time.time())
+    request_id, created = completion_meta()
+    # Chunk envelope (id/object/created/model) serialized once per stream
+    prefix = chunk_prefix(request_id, created, model_name)
+    text_buffer = TextCoalescer(prefix)
 
     try:
-        response_stream = gemini_client.models.generate_content_stream(
+        response_stream = await gemini_client.aio.models.generate_content_stream(
             model=model,
             contents=contents,
             config=config,
@@ -123,21 +150,33 @@ async def stream_gemini_response(
 
         accumulated_tool_calls = []
 
-        for chunk in response_stream:
-            # Check for function_call
-            if chunk.candidates and chunk.candidates[0].content and chunk.candidates[0].content.parts:
-                for part in chunk.candidates[0].content.parts:
-                    if hasattr(part, 'function_call') and part.function_call:
+        if not config.tools:
+            # Text-only request: no function_call parts can arrive, so skip the tool handling
+            async for chunk in with_flush_deadline(response_stream, text_buffer):
+                if type(chunk) is bytes:
+                    # Buffered text came due while waiting on upstream
+                    yield chunk
+                    continue
+                for part in _chunk_parts(chunk):
+                    text = part.text
+                    if text:
+                        frame = text_buffer.add(text)
+                        if frame:
+                            yield frame
+        else:
+            async for chunk in with_flush_deadline(response_stream, text_buffer):
+                if type(chunk) is bytes:
+                    # Buffered text came due while waiting on upstream
+                    yield chunk
+                    continue
+                for part in _chunk_parts(chunk):
+                    # Check for function_call
+                    function_call = getattr(part, 'function_call', None)
+                    if function_call:
                         # Extract thought_signature (base64 encode for client)
-                        part_thought_signature = None
-                        if hasattr(part, 'thought_signature') and part.thought_signature:
-                            ts = part.thought_signature
-                            if isinstance(ts, bytes):
-                                part_thought_signature = base64.b64encode(ts).decode('utf-8')
-                            else:
-                                part_thought_signature = str(ts)
-
-                        tool_call = convert_gemini_function_call(part.function_call, part_thought_signature)
+                        part_thought_signature = _encode_thought_signature(part.thought_signature)
+
+                        tool_call = convert_gemini_function_call(function_call, part_thought_signature)
                         accumulated_tool_calls.append(tool_call)
 
                         # Send tool call chunk (include thought_signature for client to manage)
@@ -153,84 +192,72 @@ async def stream_gemini_response(
                         if part_thought_signature:
                             tool_call_data["thought_signature"] = part_thought_signature
 
-                        delta = {
-                            "id": request_id,
-                            "object": "chat.completion.chunk",
-                            "created": created,
-                            "model": model_name,
-                            "choices": [{
-                                "index": 0,
-                                "delta": {
-                                    "tool_calls": [tool_call_data]
-                                },
-                                "finish_reason": None,
-                            }]
-                        }
-                        yield f"data: {json.dumps(delta)}\n\n"
-                    elif hasattr(part, 'text') and part.text:
-                        delta = {
-                            "id": request_id,
-                            "object": "chat.completion.chunk",
-                            "created": created,
-                            "model": model_name,
-                            "choices": [{
-                                "index": 0,
-                                "delta": {"content": part.text},
-                                "finish_reason": None,
-                            }]
-                        }
-                        yield f"data: {json.dumps(delta)}\n\n"
+                        # Text buffered so far must go out before the tool call
+                        frame = text_buffer.flush()
+                        if frame:
+                            yield frame
+                        yield delta_frame(prefix, {"tool_calls": [tool_call_data]})
+                        continue
+
+                    text = getattr(part, 'text', None)
+                    if text:
+                        frame = text_buffer.add(text)
+                        if frame:
+                            yield frame
+
+        # Emit any text still buffered
+        frame = text_buffer.flush()
+        if frame:
+            yield frame
 
         # Determine finish_reason
         finish_reason = "tool_calls" if accumulated_tool_calls else "stop"
 
-        final_delta = {
-            "id": request_id,
-            "object": "chat.completion.chunk",
-            "created": created,
-            "model": model_name,
-            "choices": [{
-                "index": 0,
-                "delta": {},
-                "finish_reason": finish_reason,
-            }]
-        }
-        yield f"data: {json.dumps(final_delta)}\n\n"
-        yield "data: [DONE]\n\n"
+        yield finish_frame(prefix, finish_reason)
+        yield DONE_FRAME
 
     except Exception as e:
-        error_data = {"error": {"message": str(e), "type": "api_error"}}
-        yield f"data: {json.dumps(error_data)}\n\n"
+        # Text received before the failure still reaches the client
+        frame = text_buffer.flush()
+        if frame:
+            yield frame
+        yield error_frame(str(e))
 
 
 def create_gemini_response(response, model_name: str) -> dict:
     """Create Gemini OpenAI format response - Supports tool calling"""
-    request_id = f"chatcmpl-{uuid.uuid4().hex[:29]}"
+    request_id, created = completion_meta()
 
-    content = ""
+    content_parts = []
     tool_calls = []
 
     if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
         for part in response.candidates[0].content.parts:
             if hasattr(part, 'function_call') and part.function_call:
                 # Extract thought_signature
-                part_thought_signature = None
-                if hasattr(part, 'thought_signature') and part.thought_signature:
-                    ts = part.thought_signature
-                    if isinstance(ts, bytes):
-                        part_thought_signature = base64.b64encode(ts).decode('utf-8')
-                    else:
-                        part_thought_signature = str(ts)
+                part_thought_signature = _encode_thought_signature(part.thought_signature)
 
                 tool_call = convert_gemini_function_call(part.function_call, part_thought_signature)
-                tool_call_dict = tool_call.model_dump(exclude_none=True)
+                # Build the dict directly rather than via model_dump()
+                tool_call_dict = {
+                    "id": tool_call.id,
+                    "type": "function",
+                    "function": {
+                        "name": tool_call.function.name,
+                        "arguments": tool_call.function.arguments
+                    }
+                }
+                if part_thought_signature:
+                    tool_call_dict["thought_signature"] = part_thought_signature
                 tool_calls.append(tool_call_dict)
             elif hasattr(part, 'text') and part.text:
-                content += part.text
+                content_parts.append(part.text)
 
     # Determine finish_reason
     finish_reason = "tool_calls" if tool_calls else "stop"
 
+    content = "".join(content_parts)
+
     # Build message
     message = {"role": "assistant"}
     if content:
@@ -242,10 +269,10 @@ def create_gemini_response(response, model_name: str) -> dict:
         message["tool_calls"] = tool_calls
 
     # Use Gemini API's usage_metadata for accurate token counts
-    usage = getattr(response, 'usage_metadata', None)
+    usage = response.usage_metadata
     if usage:
-        prompt_tokens = getattr(usage, 'prompt_token_count', 0) or 0
-        completion_tokens = getattr(usage, 'candidates_token_count', 0) or 0
+        prompt_tokens = usage.prompt_token_count or 0
+        completion_tokens = usage.candidates_token_count or 0
     else:
         prompt_tokens = 0
         completion_tokens = 0
@@ -253,7 +280,7 @@ def create_gemini_response(response, model_name: str) -> dict:
     return {
         "id": request_id,
         "object": "chat.completion",
-        "created": int(time.time()),
+        "created": created,
         "model": model_name,
         "choices": [{
             "index": 0,
@@ -3,14 +3,19 @@ Google GenAI & Anthropic Claude to OpenAI-Compatible API Proxy
 Supports Gemini and Claude on Vertex AI
 Includes Tool Calling (Function Calling) support
 """
-from typing import Optional
+import hmac
+import logging
+import logging.handlers
+import queue
+from typing import Callable, Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Header
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from google import genai
-from anthropic import AnthropicVertex
+from anthropic import AsyncAnthropicVertex
 
 # Config and models
 from config import (
@@ -29,6 +34,7 @@ from models import (
 )
 
 # Handlers
+from handlers.common import OrjsonResponse
 from handlers.gemini import handle_gemini_request, set_gemini_client
 from handlers.claude import handle_claude_request, set_claude_client
 
@@ -37,9 +43,40 @@ from handlers.claude import handle_claude_request, set_claude_client
 # Initialize Clients
 # ============================================================================
 
+def start_log_listener() -> Callable[[], None]:
+    """
+    Route request handler logs through a queue
+    
+    Records are handed off to a listener thread, so writing tracebacks to stderr
+    never blocks the event loop (e.g. when many upstream calls fail at once).
+    Returns a function that stops the listener and restores the logger.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    
+    handlers_logger = logging.getLogger("handlers")
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    propagate = handlers_logger.propagate
+    handlers_logger.addHandler(queue_handler)
+    handlers_logger.propagate = False
+    
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    
+    def stop():
+        listener.stop()
+        handlers_logger.removeHandler(queue_handler)
+        handlers_logger.propagate = propagate
+    
+    return stop
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application life cycle management"""
+    stop_log_listener = start_log_listener()
+    
     print("=" * 60)
     print("Initializing AI Clients...")
     print(f"  Project: {GOOGLE_PROJECT}")
@@ -59,7 +96,7 @@ async def lifespan(app: FastAPI):
     # Initialize Claude Client
     print(f"\n[2/2] Initializing Anthropic Claude Client (Vertex AI mode)...")
     print(f"  Claude Region: {CLAUDE_LOCATION}")
-    claude_client = AnthropicVertex(
+    claude_client = AsyncAnthropicVertex(
         project_id=GOOGLE_PROJECT,
         region=CLAUDE_LOCATION,
     )
@@ -76,6 +113,7 @@ async def lifespan(app: FastAPI):
     yield
     
     print("Shutting down...")
+    stop_log_listener()
 
 
 # ============================================================================
@@ -87,6 +125,8 @@ app = FastAPI(
     description="OpenAI-compatible proxy supporting Gemini and Claude on Vertex AI",
     version="3.0.0",
     lifespan=lifespan,
+    # Routes returning plain dicts / models are rendered with orjson
+    default_response_class=OrjsonResponse,
 )
 
 # CORS configuration
@@ -103,10 +143,14 @@ app.add_middleware(
 # Authentication
 # ============================================================================
 
-def verify_api_key(authorization: Optional[str] = Header(None)) -> bool:
-    """Verify API Key"""
+# Expected key, encoded once for the constant-time comparison
+_MASTER_KEY_BYTES = MASTER_KEY.encode()
+
+
+async def verify_api_key(authorization: Optional[str] = Header(None)) -> None:
+    """Verify API Key (route dependency)"""
     if not MASTER_KEY:
-        return True
+        return
     
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
@@ -114,11 +158,8 @@ def verify_api_key(authorization: Optional[str] = Header(None)) -> bool:
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Invalid Authorization format")
     
-    token = authorization[7:]
-    if token != MASTER_KEY:
+    if not hmac.compare_digest(authorization[7:].encode(), _MASTER_KEY_BYTES):
         raise HTTPException(status_code=401, detail="Invalid API key")
-    
-    return True
 
 
 # ============================================================================
@@ -141,37 +182,41 @@ async def health():
     return {"status": "healthy"}
 
 
-@app.get("/v1/models")
-async def list_models(authorization: Optional[str] = Header(None)):
-    """List available models"""
-    verify_api_key(authorization)
-    
+def build_models_body() -> bytes:
+    """Serialize the model list (the model mappings are fixed for the life of the process)"""
     models = []
     seen = set()
     
-    # Add Gemini models
+    # Add Gemini models (both "google/xxx" and bare names are accepted)
     for model_name in GEMINI_MODEL_MAPPING.keys():
-        if model_name not in seen:
-            models.append(ModelObject(id=model_name, owned_by="google"))
-            seen.add(model_name)
+        for model_id in (f"google/{model_name}", model_name):
+            if model_id not in seen:
+                models.append(ModelObject(id=model_id, owned_by="google"))
+                seen.add(model_id)
     
-    # Add Claude models
+    # Add Claude models (both "anthropic/xxx" and bare names are accepted)
     for model_name in CLAUDE_MODEL_MAPPING.keys():
-        if model_name not in seen:
-            models.append(ModelObject(id=model_name, owned_by="anthropic"))
-            seen.add(model_name)
+        for model_id in (f"anthropic/{model_name}", model_name):
+            if model_id not in seen:
+                models.append(ModelObject(id=model_id, owned_by="anthropic"))
+                seen.add(model_id)
     
-    return ModelsResponse(data=models)
+    return orjson.dumps(ModelsResponse(data=models).model_dump())
+
+
+# Built once at import; "created" is therefore the process start time
+MODELS_BODY = build_models_body()
 
 
-@app.post("/v1/chat/completions")
-async def chat_completions(
-    request: ChatCompletionRequest,
-    authorization: Optional[str] = Header(None),
-):
+@app.get("/v1/models", dependencies=[Depends(verify_api_key)])
+async def list_models():
+    """List available models"""
+    return Response(content=MODELS_BODY, media_type="application/json")
+
+
+@app.post("/v1/chat/completions", dependencies=[Depends(verify_api_key)])
+async def chat_completions(request: ChatCompletionRequest):
     """Chat Completions API - Automatically routes to Gemini or Claude, supports tool calling"""
-    verify_api_key(authorization)
-    
     model_name = request.model
     
     # Route to different processors based on model name
@@ -5,15 +5,19 @@ Includes Tool Calling (Function Calling) support
 import time
 from typing import List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 # ============================================================================
 # Tool Calling Related Models (OpenAI Format)
 # ============================================================================
+# Message and tool models are frozen: converters treat parsed input as read-only
+# and cache work derived from it.
 
 class ToolFunction(BaseModel):
     """Tool function definition"""
+    model_config = ConfigDict(frozen=True)
+
     name: str
     description: Optional[str] = None
     parameters: Optional[dict] = None  # JSON Schema
@@ -21,12 +25,16 @@ class ToolFunction(BaseModel):
 
 class Tool(BaseModel):
     """Tool definition"""
+    model_config = ConfigDict(frozen=True)
+
     type: str = "function"
     function: ToolFunction
 
 
 class FunctionCall(BaseModel):
     """Function call content"""
+    model_config = ConfigDict(frozen=True)
+
     name: str
     arguments: str  # JSON string
 
@@ -35,6 +43,8 @@ class ToolCall(BaseModel):
     """Tool call
     Note: Gemini 3.0+ requires thought_signature field for multi-turn tool calling
     """
+    model_config = ConfigDict(frozen=True)
+
     id: str
     type: str = "function"
     function: FunctionCall
@@ -48,6 +58,8 @@ class ToolCall(BaseModel):
 
 class ChatMessage(BaseModel):
     """Chat message - Supports tool calling"""
+    model_config = ConfigDict(frozen=True)
+
     role: str  # "user" | "assistant" | "system" | "tool"
     content: Optional[Union[str, List[dict]]] = None
     name: Optional[str] = None
@@ -80,7 +92,7 @@ class ChatCompletionRequest(BaseModel):
     top_p: Optional[float] = None
     max_tokens: Optional[int] = None
     stream: Optional[bool] = False
-    stop: Optional[Union[str, List[str]]] = None
+    stop: Optional[List[str]] = None  # A single string is accepted and wrapped in a list
     presence_penalty: Optional[float] = None
     frequency_penalty: Optional[float] = None
     user: Optional[str] = None
@@ -89,6 +101,14 @@ class ChatCompletionRequest(BaseModel):
     tools: Optional[List[Tool]] = None
     tool_choice: Optional[Union[str, dict]] = None  # "auto" | "none" | "required" | {"type": "function", "function": {"name": "xxx"}}
 
+    @field_validator("stop", mode="before")
+    @classmethod
+    def _normalize_stop(cls, v):
+        """Normalize stop to a list at parse time ("" is treated as no stop sequence)"""
+        if isinstance(v, str):
+            return [v] if v else None
+        return v
+
 
 # ============================================================================
 # Response Models
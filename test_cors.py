@@ -1,8 +1,17 @@
 """
 Test Vertex AI Proxy (Gemini + Claude)
 """
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-import json
+
+# orjson parses SSE frames faster (and straight from bytes); fall back to the stdlib if missing
+try:
+    import orjson as json_lib
+except ImportError:
+    import json as json_lib
 
 # Configuration
 ENDPOINT_URL = "http://localhost:8080"  # Change to your Cloud Run URL if deployed
@@ -11,464 +20,298 @@ API_KEY = "your-api-key-here"  # Set your MASTER_KEY
 # Remote endpoint example
 # ENDPOINT_URL = "https://your-project.run.app"
 
+# One session per worker thread (requests.Session is not documented as thread-safe);
+# each keeps its connection alive across the tests that thread runs
+_thread_local = threading.local()
 
-def test_health():
-    """Test health check"""
-    print("=" * 60)
-    print("1. Test Health Check (/health)")
-    print("=" * 60)
-    
-    try:
-        response = requests.get(f"{ENDPOINT_URL}/health")
-        print(f"   Status Code: {response.status_code}")
-        print(f"   Response: {response.json()}")
-        if response.status_code == 200:
-            print("   ✅ Health check passed!")
-        else:
-            print("   ❌ Health check failed!")
-    except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    print()
 
+def session() -> requests.Session:
+    """The calling thread's session, created on first use"""
+    sess = getattr(_thread_local, "session", None)
+    if sess is None:
+        sess = requests.Session()
+        sess.headers.update({"Authorization": f"Bearer {API_KEY}"})
+        _thread_local.session = sess
+    return sess
 
-def test_models():
-    """Test model listing"""
-    print("=" * 60)
-    print("2. Test Model Listing (/v1/models)")
-    print("=" * 60)
-    
-    try:
-        response = requests.get(
-            f"{ENDPOINT_URL}/v1/models",
-            headers={"Authorization": f"Bearer {API_KEY}"}
-        )
-        
-        print(f"   Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            models = data.get("data", [])
-            
-            gemini_models = [m for m in models if m.get("owned_by") == "google"]
-            claude_models = [m for m in models if m.get("owned_by") == "anthropic"]
-            
-            print(f"\n   Gemini Models ({len(gemini_models)}):")
-            for model in gemini_models[:5]:
-                print(f"     - {model.get('id')}")
-            if len(gemini_models) > 5:
-                print(f"     ... and {len(gemini_models) - 5} more")
-            
-            print(f"\n   Claude Models ({len(claude_models)}):")
-            for model in claude_models[:5]:
-                print(f"     - {model.get('id')}")
-            if len(claude_models) > 5:
-                print(f"     ... and {len(claude_models) - 5} more")
-            
-            print("\n   ✅ Model listing successful!")
-        else:
-            print(f"   ❌ Request failed: {response.text[:200]}")
-    except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    print()
 
+# Request bodies are fixed, so they are serialized once at import
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-def test_gemini_chat():
-    """Test Gemini chat"""
-    print("=" * 60)
-    print("3. Test Gemini Chat (Non-streaming)")
-    print("=" * 60)
-    
-    try:
-        response = requests.post(
-            f"{ENDPOINT_URL}/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "google/gemini-3-flash-preview",
-                "messages": [
-                    {"role": "user", "content": "Say 'Hello from Gemini!' and nothing else."}
-                ],
-                "stream": False,
-                "max_tokens": 50
-            }
-        )
-        
-        print(f"   Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-            print(f"   Response Content: {content}")
-            print("   ✅ Gemini chat successful!")
-        else:
-            print(f"   ❌ Request failed: {response.text[:300]}")
-    except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    print()
 
+def json_body(payload: dict) -> bytes:
+    """Serialize a fixed request body once instead of on every request"""
+    body = json_lib.dumps(payload)
+    return body if isinstance(body, bytes) else body.encode()
 
-def test_claude_chat():
-    """Test Claude chat"""
-    print("=" * 60)
-    print("4. Test Claude Chat (Non-streaming)")
-    print("=" * 60)
-    
-    try:
-        response = requests.post(
-            f"{ENDPOINT_URL}/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "anthropic/claude-sonnet-4-5",
-                "messages": [
-                    {"role": "user", "content": "Say 'Hello from Claude!' and nothing else."}
-                ],
-                "stream": False,
-                "max_tokens": 50
-            }
-        )
-        
-        print(f"   Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-            print(f"   Response Content: {content}")
-            print("   ✅ Claude chat successful!")
-        else:
-            print(f"   ❌ Request failed: {response.text[:300]}")
-    except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    print()
 
+GEMINI_CHAT_BODY = json_body({
+    "model": "google/gemini-3-flash-preview",
+    "messages": [
+        {"role": "user", "content": "Say 'Hello from Gemini!' and nothing else."}
+    ],
+    "stream": False,
+    "max_tokens": 50
+})
 
-def test_gemini_stream():
-    """Test Gemini streaming chat"""
-    print("=" * 60)
-    print("5. Test Gemini Streaming Chat")
-    print("=" * 60)
-    
-    try:
-        response = requests.post(
-            f"{ENDPOINT_URL}/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "google/gemini-3-flash-preview",
-                "messages": [
-                    {"role": "user", "content": "Count from 1 to 3."}
-                ],
-                "stream": True,
-                "max_tokens": 50
-            },
-            stream=True
-        )
-        
-        print(f"   Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            print("   Streaming Response:")
-            full_content = ""
-            for line in response.iter_lines():
-                if line:
-                    decoded = line.decode('utf-8')
-                    if decoded.startswith("data: ") and decoded != "data: [DONE]":
-                        try:
-                            data = json.loads(decoded[6:])
-                            content = data.get("choices", [{}])[0].get("delta", {}).get("content", "")
-                            if content:
-                                full_content += content
-                        except:
-                            pass
-            print(f"     {full_content}")
-            print("   ✅ Gemini streaming chat successful!")
-        else:
-            print(f"   ❌ Request failed: {response.text[:300]}")
-    except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    print()
+CLAUDE_CHAT_BODY = json_body({
+    "model": "anthropic/claude-sonnet-4-5",
+    "messages": [
+        {"role": "user", "content": "Say 'Hello from Claude!' and nothing else."}
+    ],
+    "stream": False,
+    "max_tokens": 50
+})
 
+GEMINI_STREAM_BODY = json_body({
+    "model": "google/gemini-3-flash-preview",
+    "messages": [
+        {"role": "user", "content": "Count from 1 to 3."}
+    ],
+    "stream": True,
+    "max_tokens": 50
+})
 
-def test_claude_stream():
-    """Test Claude streaming chat"""
-    print("=" * 60)
-    print("6. Test Claude Streaming Chat")
-    print("=" * 60)
-    
-    try:
-        response = requests.post(
-            f"{ENDPOINT_URL}/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "anthropic/claude-haiku-3",
-                "messages": [
-                    {"role": "user", "content": "Count from 1 to 3."}
-                ],
-                "stream": True,
-                "max_tokens": 50
-            },
-            stream=True
-        )
-        
-        print(f"   Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            print("   Streaming Response:")
-            full_content = ""
-            for line in response.iter_lines():
-                if line:
-                    decoded = line.decode('utf-8')
-                    if decoded.startswith("data: ") and decoded != "data: [DONE]":
-                        try:
-                            data = json.loads(decoded[6:])
-                            content = data.get("choices", [{}])[0].get("delta", {}).get("content", "")
-                            if content:
-                                full_content += content
-                        except:
-                            pass
-            print(f"     {full_content}")
-            print("   ✅ Claude streaming chat successful!")
-        else:
-            print(f"   ❌ Request failed: {response.text[:300]}")
-    except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    print()
+CLAUDE_STREAM_BODY = json_body({
+    "model": "anthropic/claude-haiku-3",
+    "messages": [
+        {"role": "user", "content": "Count from 1 to 3."}
+    ],
+    "stream": True,
+    "max_tokens": 50
+})
 
+GEMINI_TOOL_BODY = json_body({
+    "model": "google/gemini-3-flash-preview",
+    "messages": [
+        {"role": "user", "content": "What is the weather in Tokyo?"}
+    ],
+    "tools": [{
+        "type": "function",
+        "function": {
+            "name": "get_weather",
+            "description": "Get the current weather in a given location",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "location": {
+                        "type": "string",
+                        "description": "The city name, e.g. Tokyo"
+                    }
+                },
+                "required": ["location"]
+            }
+        }
+    }],
+    "stream": False,
+    "max_tokens": 200
+})
 
-def test_gemini_tool_call():
-    """Test Gemini tool calling"""
-    print("=" * 60)
-    print("7. Test Gemini Tool Calling")
-    print("=" * 60)
-    
-    try:
-        response = requests.post(
-            f"{ENDPOINT_URL}/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "google/gemini-3-flash-preview",
-                "messages": [
-                    {"role": "user", "content": "What is the weather in Tokyo?"}
-                ],
-                "tools": [{
-                    "type": "function",
-                    "function": {
-                        "name": "get_weather",
-                        "description": "Get the current weather in a given location",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "location": {
-                                    "type": "string",
-                                    "description": "The city name, e.g. Tokyo"
-                                }
-                            },
-                            "required": ["location"]
-                        }
+CLAUDE_TOOL_BODY = json_body({
+    "model": "anthropic/claude-haiku-3.5",
+    "messages": [
+        {"role": "user", "content": "What is the weather in San Francisco?"}
+    ],
+    "tools": [{
+        "type": "function",
+        "function": {
+            "name": "get_weather",
+            "description": "Get the current weather in a given location",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "location": {
+                        "type": "string",
+                        "description": "The city and state, e.g. San Francisco, CA"
+                    },
+                    "unit": {
+                        "type": "string",
+                        "enum": ["celsius", "fahrenheit"],
+                        "description": "The unit of temperature"
                     }
-                }],
-                "stream": False,
-                "max_tokens": 200
+                },
+                "required": ["location"]
             }
-        )
-        
-        print(f"   Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            message = data.get("choices", [{}])[0].get("message", {})
-            tool_calls = message.get("tool_calls", [])
-            finish_reason = data.get("choices", [{}])[0].get("finish_reason", "")
-            
-            if tool_calls:
-                print(f"   Tool Calls Count: {len(tool_calls)}")
-                for tc in tool_calls:
-                    print(f"   - Function Name: {tc.get('function', {}).get('name')}")
-                    print(f"     Arguments: {tc.get('function', {}).get('arguments')}")
-                print(f"   finish_reason: {finish_reason}")
-                print("   ✅ Gemini tool calling successful!")
-            else:
-                content = message.get("content", "")
-                print(f"   Response Content: {content[:100]}...")
-                print("   ⚠️ Model did not return tool calls (may have answered the question directly)")
-        else:
-            print(f"   ❌ Request failed: {response.text[:300]}")
-    except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    print()
+        }
+    }],
+    "stream": False,
+    "max_tokens": 200
+})
 
+RESPONSES_BODY = json_body({
+    "model": "google/gemini-3-flash-preview",
+    "input": "Tell me a three sentence bedtime story about a unicorn.",
+    "max_output_tokens": 200
+})
 
-def test_claude_tool_call():
-    """Test Claude tool calling"""
-    print("=" * 60)
-    print("8. Test Claude Tool Calling")
-    print("=" * 60)
+RESPONSES_INSTRUCTIONS_BODY = json_body({
+    "model": "anthropic/claude-sonnet-4.5",
+    "instructions": "You are a pirate who speaks in pirate dialect.",
+    "input": "Introduce yourself in one sentence.",
+    "max_output_tokens": 100
+})
+
+
+def post(path: str, body: bytes, stream: bool = False) -> requests.Response:
+    """POST a pre-serialized JSON body to the proxy"""
+    return session().post(f"{ENDPOINT_URL}{path}", data=body, headers=JSON_HEADERS, stream=stream)
+
+
+def run_test(title: str, send, report) -> str:
+    """
+    Shared test scaffolding: banner, request, status check, error handling and timing
+    
+    send() performs the request; report(response) yields the detail lines of a 200 response.
+    Returns the test's full report text.
+    """
+    lines = ["=" * 60, title, "=" * 60]
     
+    start = time.perf_counter()
     try:
-        response = requests.post(
-            f"{ENDPOINT_URL}/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "anthropic/claude-haiku-3.5",
-                "messages": [
-                    {"role": "user", "content": "What is the weather in San Francisco?"}
-                ],
-                "tools": [{
-                    "type": "function",
-                    "function": {
-                        "name": "get_weather",
-                        "description": "Get the current weather in a given location",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "location": {
-                                    "type": "string",
-                                    "description": "The city and state, e.g. San Francisco, CA"
-                                },
-                                "unit": {
-                                    "type": "string",
-                                    "enum": ["celsius", "fahrenheit"],
-                                    "description": "The unit of temperature"
-                                }
-                            },
-                            "required": ["location"]
-                        }
-                    }
-                }],
-                "stream": False,
-                "max_tokens": 200
-            }
-        )
-        
-        print(f"   Status Code: {response.status_code}")
+        response = send()
+        lines.append(f"   Status Code: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
-            message = data.get("choices", [{}])[0].get("message", {})
-            tool_calls = message.get("tool_calls", [])
-            finish_reason = data.get("choices", [{}])[0].get("finish_reason", "")
-            
-            if tool_calls:
-                print(f"   Tool Calls Count: {len(tool_calls)}")
-                for tc in tool_calls:
-                    print(f"   - Function Name: {tc.get('function', {}).get('name')}")
-                    print(f"     Arguments: {tc.get('function', {}).get('arguments')}")
-                print(f"   finish_reason: {finish_reason}")
-                print("   ✅ Claude tool calling successful!")
-            else:
-                content = message.get("content", "")
-                print(f"   Response Content: {content[:100]}...")
-                print("   ⚠️ Model did not return tool calls (may have answered the question directly)")
+            lines.extend(report(response))
         else:
-            print(f"   ❌ Request failed: {response.text[:300]}")
+            lines.append(f"   ❌ Request failed: {response.text[:300]}")
     except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    print()
+        lines.append(f"   ❌ Request failed: {e}")
+    lines.append(f"   Time: {time.perf_counter() - start:.2f}s")
+    return "\n".join(lines) + "\n\n"
 
 
-def test_responses_api():
-    """Test Responses API (New Standard)"""
-    print("=" * 60)
-    print("9. Test Responses API (/v1/responses)")
-    print("=" * 60)
+def report_health(response):
+    """Health check"""
+    yield f"   Response: {response.json()}"
+    yield "   ✅ Health check passed!"
+
+
+def report_models(response):
+    """Model listing"""
+    models = response.json().get("data", [])
     
-    try:
-        response = requests.post(
-            f"{ENDPOINT_URL}/v1/responses",
-            headers={
-                "Authorization": f"Bearer {API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "google/gemini-3-flash-preview",
-                "input": "Tell me a three sentence bedtime story about a unicorn.",
-                "max_output_tokens": 200
-            }
-        )
-        
-        print(f"   Status Code: {response.status_code}")
+    for label, owner in (("Gemini", "google"), ("Claude", "anthropic")):
+        owned = [m for m in models if m.get("owned_by") == owner]
+        yield f"\n   {label} Models ({len(owned)}):"
+        for model in owned[:5]:
+            yield f"     - {model.get('id')}"
+        if len(owned) > 5:
+            yield f"     ... and {len(owned) - 5} more"
+    
+    yield "\n   ✅ Model listing successful!"
+
+
+def chat_report(provider: str):
+    """Non-streaming chat"""
+    def report(response):
+        content = response.json().get("choices", [{}])[0].get("message", {}).get("content", "")
+        yield f"   Response Content: {content}"
+        yield f"   ✅ {provider} chat successful!"
+    return report
+
+
+def stream_report(provider: str):
+    """Streaming chat"""
+    def report(response):
+        yield "   Streaming Response:"
+        content_parts = []
+        for line in response.iter_lines():
+            # Work on raw bytes; only the JSON payload is decoded
+            if not line.startswith(b"data: "):
+                continue
+            payload = line[6:]
+            if payload == b"[DONE]":
+                break
+            try:
+                data = json_lib.loads(payload)
+                content = data.get("choices", [{}])[0].get("delta", {}).get("content", "")
+                if content:
+                    content_parts.append(content)
+            except:
+                pass
+        yield f"     {''.join(content_parts)}"
+        yield f"   ✅ {provider} streaming chat successful!"
+    return report
+
+
+def tool_call_report(provider: str):
+    """Tool calling"""
+    def report(response):
+        choice = response.json().get("choices", [{}])[0]
+        message = choice.get("message", {})
+        tool_calls = message.get("tool_calls", [])
         
-        if response.status_code == 200:
-            data = response.json()
-            print(f"   Response ID: {data.get('id')}")
-            print(f"   Status: {data.get('status')}")
-            
-            output = data.get("output", [])
-            if output:
-                for item in output:
-                    if item.get("type") == "message":
-                        content = item.get("content", [])
-                        for c in content:
-                            if c.get("type") == "output_text":
-                                text = c.get("text", "")[:100]
-                                print(f"   Content: {text}...")
-            
-            usage = data.get("usage", {})
-            print(f"   Token Usage: input={usage.get('input_tokens')}, output={usage.get('output_tokens')}")
-            print("   ✅ Responses API test successful!")
+        if tool_calls:
+            yield f"   Tool Calls Count: {len(tool_calls)}"
+            for tc in tool_calls:
+                yield f"   - Function Name: {tc.get('function', {}).get('name')}"
+                yield f"     Arguments: {tc.get('function', {}).get('arguments')}"
+            yield f"   finish_reason: {choice.get('finish_reason', '')}"
+            yield f"   ✅ {provider} tool calling successful!"
         else:
-            print(f"   ❌ Request failed: {response.text[:300]}")
-    except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    print()
+            content = message.get("content", "")
+            yield f"   Response Content: {content[:100]}..."
+            yield "   ⚠️ Model did not return tool calls (may have answered the question directly)"
+    return report
 
 
-def test_responses_api_with_instructions():
-    """Test Responses API (with instructions)"""
-    print("=" * 60)
-    print("10. Test Responses API (with instructions)")
-    print("=" * 60)
+def output_texts(data: dict):
+    """Yield the output_text parts of a Responses API result"""
+    for item in data.get("output", []):
+        if item.get("type") == "message":
+            for c in item.get("content", []):
+                if c.get("type") == "output_text":
+                    yield c.get("text", "")
+
+
+def report_responses(response):
+    """Responses API"""
+    data = response.json()
+    yield f"   Response ID: {data.get('id')}"
+    yield f"   Status: {data.get('status')}"
     
-    try:
-        response = requests.post(
-            f"{ENDPOINT_URL}/v1/responses",
-            headers={
-                "Authorization": f"Bearer {API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "anthropic/claude-sonnet-4.5",
-                "instructions": "You are a pirate who speaks in pirate dialect.",
-                "input": "Introduce yourself in one sentence.",
-                "max_output_tokens": 100
-            }
-        )
-        
-        print(f"   Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"   Response ID: {data.get('id')}")
-            
-            output = data.get("output", [])
-            if output:
-                for item in output:
-                    if item.get("type") == "message":
-                        content = item.get("content", [])
-                        for c in content:
-                            if c.get("type") == "output_text":
-                                print(f"   Content: {c.get('text', '')}")
-            print("   ✅ Responses API (instructions) test successful!")
-        else:
-            print(f"   ❌ Request failed: {response.text[:300]}")
-    except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    print()
+    for text in output_texts(data):
+        yield f"   Content: {text[:100]}..."
+    
+    usage = data.get("usage", {})
+    yield f"   Token Usage: input={usage.get('input_tokens')}, output={usage.get('output_tokens')}"
+    yield "   ✅ Responses API test successful!"
+
+
+def report_responses_instructions(response):
+    """Responses API (with instructions)"""
+    data = response.json()
+    yield f"   Response ID: {data.get('id')}"
+    
+    for text in output_texts(data):
+        yield f"   Content: {text}"
+    yield "   ✅ Responses API (instructions) test successful!"
+
+
+# (title, send, report) - every test is independent of the others
+ALL_TESTS = [
+    ("1. Test Health Check (/health)",
+     lambda: session().get(f"{ENDPOINT_URL}/health"), report_health),
+    ("2. Test Model Listing (/v1/models)",
+     lambda: session().get(f"{ENDPOINT_URL}/v1/models"), report_models),
+    ("3. Test Gemini Chat (Non-streaming)",
+     lambda: post("/v1/chat/completions", GEMINI_CHAT_BODY), chat_report("Gemini")),
+    ("4. Test Claude Chat (Non-streaming)",
+     lambda: post("/v1/chat/completions", CLAUDE_CHAT_BODY), chat_report("Claude")),
+    ("5. Test Gemini Streaming Chat",
+     lambda: post("/v1/chat/completions", GEMINI_STREAM_BODY, stream=True), stream_report("Gemini")),
+    ("6. Test Claude Streaming Chat",
+     lambda: post("/v1/chat/completions", CLAUDE_STREAM_BODY, stream=True), stream_report("Claude")),
+    ("7. Test Gemini Tool Calling",
+     lambda: post("/v1/chat/completions", GEMINI_TOOL_BODY), tool_call_report("Gemini")),
+    ("8. Test Claude Tool Calling",
+     lambda: post("/v1/chat/completions", CLAUDE_TOOL_BODY), tool_call_report("Claude")),
+    ("9. Test Responses API (/v1/responses)",
+     lambda: post("/v1/responses", RESPONSES_BODY), report_responses),
+    ("10. Test Responses API (with instructions)",
+     lambda: post("/v1/responses", RESPONSES_INSTRUCTIONS_BODY), report_responses_instructions),
+]
 
 
 def main():
@@ -477,16 +320,12 @@ def main():
     print(f"Endpoint: {ENDPOINT_URL}")
     print("=" * 60 + "\n")
     
-    test_health()
-    test_models()
-    test_gemini_chat()
-    test_claude_chat()
-    test_gemini_stream()
-    test_claude_stream()
-    test_gemini_tool_call()
-    test_claude_tool_call()
-    test_responses_api()
-    test_responses_api_with_instructions()
+    # Tests are independent; run them concurrently and print each one's report in order
+    with ThreadPoolExecutor(max_workers=len(ALL_TESTS)) as executor:
+        reports = list(executor.map(lambda test: run_test(*test), ALL_TESTS))
+    
+    for report in reports:
+        print(report, end="")
     
     print("=" * 60)
     print("All tests completed!")